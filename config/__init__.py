@@ -1,2 +1,2 @@
 from .base_config import Config
-from .load_config import load_config_from_yaml
\ No newline at end of file
+from .load_config import load_config_from_yaml, load_config_from_dict
@@ -1,8 +1,8 @@
 from typing import Optional, List
 import numpy as np
 from dataclasses import dataclass, field
-from enums import OptionSide, OptionType, ExerciseFrequency, CorrelationType
-from core import get_nn_sizes
+from enums import OptionSide, OptionType, ExerciseFrequency, CorrelationType, PayoffStyle
+from core import get_nn_sizes, get_pricer
 
 
 EPSILON = 1e-8
@@ -34,10 +34,16 @@ class Config:
     exercise_points: Optional[List[int]] = None
     correlation_matrix: Optional[List[List[float]]] = None
     correlation_type: Optional[CorrelationType] = None
+    payoff_style: Optional[PayoffStyle] = None
+    pricers: List[str] = field(default_factory=lambda: ["lsm_fnn"])
+    exercise_dates_only: bool = False
+    num_workers: int = 1
 
     # === Computed fields ===
     time_step: float = field(init=False)
     nn_layers: List[int] = field(init=False)
+    time_grid: Optional[np.ndarray] = field(init=False)
+    grid_exercise_points: Optional[np.ndarray] = field(init=False)
 
 
     def __post_init__(self):
@@ -51,8 +57,15 @@ class Config:
             if self.exercise_frequency is not None:
                 raise ValueError("Only Bermudan options should specify exercise frequency.")
             
+        if self.dimensions > 1 and self.payoff_style is None:
+            self.payoff_style = PayoffStyle.BASKET
+
+        for name in self.pricers:
+            get_pricer(name)
+
         self.exercise_points = self.get_excercise_points()
         self.correlation_matrix = self.get_correlation_matrix()
+        self.time_grid, self.grid_exercise_points = self.get_time_grid()
 
 
     def get_excercise_points(self):
@@ -81,6 +94,29 @@ class Config:
         return np.linspace(0, self.num_of_steps, num_of_dates, dtype=int)
     
 
+    def get_time_grid(self):
+        """
+        Returns the simulation times (in years) and the exercise points as indices into them
+        when only the exercise dates are simulated, otherwise (None, None)
+        """
+        if not self.exercise_dates_only:
+            return None, None
+
+        if self.option_type == OptionType.AMERICAN:
+            raise ValueError("American options can be exercised at every step, exercise_dates_only requires a Bermudan or European option")
+
+        steps = np.array([0, self.num_of_steps])
+        if self.option_type == OptionType.BERMUDAN:
+            steps = np.union1d(steps, self.exercise_points)
+
+        time_grid = steps * self.time_step
+
+        if self.option_type == OptionType.BERMUDAN:
+            return time_grid, np.flatnonzero(np.isin(steps, self.exercise_points))
+
+        return time_grid, None
+
+
     def get_correlation_matrix(self):
         if self.dimensions == 1:
             return None
@@ -145,10 +181,14 @@ class Config:
         - Correlation Type: {self.correlation_type}
         - Correlation Rho: {self.correlation_rho}
         - Correlation Matrix: {self.correlation_matrix}
+        - Payoff Style: {self.payoff_style}
         
         Model Parameters:  
+        - Pricers: {self.pricers}
+        - Simulate exercise dates only: {self.exercise_dates_only}
         - Number of paths: {self.num_of_paths}
         - Number of steps: {self.num_of_steps} 
+        - Number of workers: {self.num_workers}
         - Poly degree: {self.poly_degree}      
         - Neural Network Layers: {self.nn_layers}
         - Epochs: {self.epochs}
@@ -1,7 +1,7 @@
 import yaml
 import numpy as np
 from config import Config
-from enums import OptionType, OptionSide, ExerciseFrequency, CorrelationType
+from enums import OptionType, OptionSide, ExerciseFrequency, CorrelationType, PayoffStyle
 
 def load_config_from_yaml(path: str):
     with open(path, "r") as f:
@@ -9,23 +9,43 @@ def load_config_from_yaml(path: str):
         # safe_load = no sys cmds can be ran (rm -rf)
         data = yaml.safe_load(f)
 
+    return load_config_from_dict(data)
+
+
+def load_config_from_dict(data: dict):
+    """
+    Builds a Config from a raw mapping shaped like config.yaml (e.g. a parsed JSON request)
+    """
+    data = dict(data)
+
     # Convert string to enums
     data["option_type"] = OptionType[data["option_type"]]
     data["option_side"] = OptionSide[data["option_side"]]
-    data["correlation_type"] = CorrelationType[data["correlation_type"]]
 
-    if data["exercise_frequency"] is not None:
+    if data.get("correlation_type") is not None:
+        data["correlation_type"] = CorrelationType[data["correlation_type"]]
+
+    if data.get("payoff_style") is not None:
+        data["payoff_style"] = PayoffStyle[data["payoff_style"]]
+
+    if data.get("exercise_frequency") is not None:
         data["exercise_frequency"] = ExerciseFrequency[data["exercise_frequency"]]
 
     # Convert custom exercise points
-    if data["exercise_points"] is not None:
+    if data.get("exercise_points") is not None:
         data["exercise_points"] = np.array(data["exercise_points"])
 
-    if data["correlation_matrix"] is not None:
+    if data.get("correlation_matrix") is not None:
         data["correlation_matrix"] = np.array(data["correlation_matrix"])
 
-    # Convert list to numpy arrays
+    # Convert list to numpy arrays, one float per asset
     for arr in ["init_stock_prices", "strike_prices", "volatilities"]:
-        data[arr] = np.array(data[arr])
+        data[arr] = np.array(data[arr], dtype=float)
+        if data[arr].shape != (data["dimensions"],):
+            raise ValueError(f"{arr} must be a list of {data['dimensions']} numbers, got {data[arr].tolist()}")
+
+    for scalar in ["risk_free_interest", "time_to_exp"]:
+        if isinstance(data[scalar], bool) or not isinstance(data[scalar], (int, float)):
+            raise TypeError(f"{scalar} must be a number, got {data[scalar]!r}")
 
     return Config(**data)
@@ -1,5 +1,33 @@
 from .gbm import generate_gbm_paths, generate_multidim_gbm_paths
-from .lsm_traditional import lsm_traditional
-from .lsm_fnn import lsm_global_fnn
+from .gbm import generate_gbm_paths_on_grid, generate_multidim_gbm_paths_on_grid
+from .lsm_traditional import lsm_traditional, lsm_traditional_batch, exercise_date_mask
+from .lsm_sharded import lsm_sharded
 from .binomial_tree import binomial_tree
-from .neural_net import LSMContinuationNN, get_nn_sizes
\ No newline at end of file
+from .nn_sizes import get_nn_sizes
+from .payoffs import compute_payoff, basket_value
+from .exercise_boundary import ExerciseBoundary, BOUNDARY_CACHE, solve_exercise_boundary
+from .exercise_boundary import boundary_from_poly, boundary_from_fnn, boundary_price, lsm_boundary
+from .exercise_boundary import cache_boundary, cached_boundary, save_boundary, load_boundary
+from .spot_shift import SpotShiftRepricer
+from .registry import PricerSpec, PRICERS, register_pricer, get_pricer, simulate_paths
+
+# Torch-backed modules are only imported on first attribute access (PEP 562),
+# so polynomial and binomial runs never pay for the torch import
+import importlib
+
+_LAZY_EXPORTS = {
+    "lsm_global_fnn": ".lsm_fnn",
+    "fit_global_fnn": ".lsm_fnn",
+    "build_training_set": ".lsm_fnn",
+    "train_data_parallel": ".parallel_training",
+    "LSMContinuationNN": ".neural_net",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,264 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from enums import OptionSide, OptionType
+from .lsm_traditional import lsm_traditional, exercise_date_mask
+from .payoffs import compute_payoff
+
+
+@dataclass
+class ExerciseBoundary:
+    """
+    Critical prices S*(t) of a single asset option on its exercise dates, stored with the contract they belong to
+
+    A put is exercised when S_t < S*(t) and a call when S_t > S*(t). A critical price of 0 (put) or inf (call)
+    means the date is never exercised
+    """
+    K: float
+    r: float
+    sigma: float
+    option_side: OptionSide
+    option_type: OptionType
+    times: np.ndarray           # time in years of every column of the path grid
+    exercise_dates: np.ndarray  # column indices where early exercise is allowed, ascending
+    critical_prices: np.ndarray # S*(t) for each exercise date
+    model_tag: str = "poly"     # continuation model the boundary was solved from, e.g. "poly" or "fnn"
+    poly_degree: Optional[int] = None
+
+    def contract_key(self) -> Tuple:
+        return boundary_key(self.K, self.r, self.sigma, self.option_side, self.option_type,
+                            self.times, self.exercise_dates, self.model_tag, self.poly_degree)
+
+
+def boundary_key(K: float, r: float, sigma: float, option_side: OptionSide, option_type: OptionType,
+                 times: np.ndarray, exercise_dates: np.ndarray, model_tag: str,
+                 poly_degree: Optional[int] = None) -> Tuple:
+    return (float(K), float(r), float(sigma), option_side, option_type,
+            tuple(np.round(np.asarray(times, dtype=float), 12)), tuple(int(t) for t in exercise_dates),
+            model_tag, poly_degree)
+
+
+# In-memory LRU cache of solved boundaries, keyed by boundary_key
+MAX_CACHED_BOUNDARIES = 256
+BOUNDARY_CACHE: "OrderedDict[Tuple, ExerciseBoundary]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cache_boundary(boundary: ExerciseBoundary) -> ExerciseBoundary:
+    """
+    Adds the boundary to BOUNDARY_CACHE, evicting the least recently used ones beyond MAX_CACHED_BOUNDARIES
+    """
+    key = boundary.contract_key()
+    with _cache_lock:
+        BOUNDARY_CACHE[key] = boundary
+        BOUNDARY_CACHE.move_to_end(key)
+        while len(BOUNDARY_CACHE) > MAX_CACHED_BOUNDARIES:
+            BOUNDARY_CACHE.popitem(last=False)
+    return boundary
+
+
+def cached_boundary(key: Tuple) -> Optional[ExerciseBoundary]:
+    with _cache_lock:
+        boundary = BOUNDARY_CACHE.get(key)
+        if boundary is not None:
+            BOUNDARY_CACHE.move_to_end(key)
+        return boundary
+
+
+def save_boundary(boundary: ExerciseBoundary, path: str):
+    np.savez(path, K=boundary.K, r=boundary.r, sigma=boundary.sigma,
+             option_side=boundary.option_side.name, option_type=boundary.option_type.name,
+             times=boundary.times, exercise_dates=boundary.exercise_dates,
+             critical_prices=boundary.critical_prices, model_tag=boundary.model_tag,
+             poly_degree=-1 if boundary.poly_degree is None else boundary.poly_degree)
+
+
+def load_boundary(path: str) -> ExerciseBoundary:
+    with np.load(path) as data:
+        poly_degree = int(data["poly_degree"])
+        return ExerciseBoundary(K=float(data["K"]), r=float(data["r"]), sigma=float(data["sigma"]),
+                                option_side=OptionSide[str(data["option_side"])],
+                                option_type=OptionType[str(data["option_type"])],
+                                times=data["times"], exercise_dates=data["exercise_dates"],
+                                critical_prices=data["critical_prices"], model_tag=str(data["model_tag"]),
+                                poly_degree=None if poly_degree < 0 else poly_degree)
+
+
+def solve_exercise_boundary(continuation: Callable[[np.ndarray, np.ndarray], np.ndarray], K: float,
+                            option_side: OptionSide, num_dates: int, num_grid: int = 64, num_iters: int = 40,
+                            upper_multiple: float = 4.0) -> np.ndarray:
+    """
+    Finds S*(t) where the exercise value equals the continuation value, for all dates at once
+
+    A coarse scan over the search interval brackets the edge of the exercise region on every date,
+    then a vectorized bisection refines all brackets together. Each step is a single continuation call
+    covering every date. A put is searched on (0, K] and a call on [K, upper_multiple * K]
+
+    Args:
+        continuation (Callable): continuation(S, date_index) -> continuation values, for 1d arrays of any length
+        K (float): Strike price
+        option_side (OptionSide): Put or call
+        num_dates (int): Number of exercise dates
+        num_grid (int): Points in the coarse scan
+        num_iters (int): Bisection iterations
+
+    Returns:
+        np.ndarray: Critical price per date, 0 (put) or inf (call) where it is never optimal to exercise
+    """
+    if option_side == OptionSide.PUT:
+        grid = np.linspace(1e-6 * K, K, num_grid)
+    elif option_side == OptionSide.CALL:
+        grid = np.linspace(K, upper_multiple * K, num_grid)
+    else:
+        raise ValueError("option_type must be 'put' or 'call'")
+
+    sign = 1.0 if option_side == OptionSide.CALL else -1.0
+
+    # > 0 where exercising beats continuing
+    def exercise_premium(S, date_index):
+        return sign * (S - K) - continuation(S, date_index)
+
+    date_index = np.arange(num_dates)
+    S_scan = np.tile(grid, num_dates)
+    exercise_scan = (exercise_premium(S_scan, np.repeat(date_index, num_grid)) > 0).reshape(num_dates, num_grid)
+    never = ~exercise_scan.any(axis=1)
+
+    # Put: highest grid point still in the exercise region. Call: lowest one
+    if option_side == OptionSide.PUT:
+        edge = num_grid - 1 - exercise_scan[:, ::-1].argmax(axis=1)
+        always = edge == num_grid - 1
+        edge = np.minimum(edge, num_grid - 2)
+        lo, hi = grid[edge], grid[edge + 1]
+    else:
+        edge = exercise_scan.argmax(axis=1)
+        always = edge == 0
+        edge = np.maximum(edge, 1)
+        lo, hi = grid[edge - 1], grid[edge]
+
+    for _ in range(num_iters):
+        mid = 0.5 * (lo + hi)
+        exercise_mid = exercise_premium(mid, date_index) > 0
+        # Keep the exercise region on the low side for a put and the high side for a call
+        if option_side == OptionSide.PUT:
+            lo, hi = np.where(exercise_mid, mid, lo), np.where(exercise_mid, hi, mid)
+        else:
+            lo, hi = np.where(exercise_mid, lo, mid), np.where(exercise_mid, mid, hi)
+
+    critical_prices = 0.5 * (lo + hi)
+    critical_prices[always] = K
+    critical_prices[never] = 0.0 if option_side == OptionSide.PUT else np.inf
+    return critical_prices
+
+
+def boundary_from_poly(coefficients: Dict[int, np.ndarray], K: float, r: float, sigma: float,
+                       option_side: OptionSide, option_type: OptionType, times: np.ndarray,
+                       exercise_dates: np.ndarray, poly_degree: int) -> ExerciseBoundary:
+    """
+    Builds the boundary from the per-date polynomials returned by lsm_traditional(..., return_coefficients=True)
+
+    Dates without a fitted polynomial are never exercised by lsm_traditional, so they never are here either
+    """
+    exercise_dates = np.sort(np.asarray(exercise_dates, dtype=int))
+    fitted = np.array([t in coefficients for t in exercise_dates], dtype=bool)
+
+    num_coeffs = max((len(c) for c in coefficients.values()), default=1)
+    coeff_matrix = np.zeros((len(exercise_dates), num_coeffs))
+    for i, t in enumerate(exercise_dates):
+        if fitted[i]:
+            coeff_matrix[i, num_coeffs - len(coefficients[t]):] = coefficients[t]
+
+    def continuation(S, date_index):
+        # Horner's rule with a different polynomial per row
+        value = np.zeros_like(S)
+        for j in range(num_coeffs):
+            value = value * S + coeff_matrix[date_index, j]
+        return value
+
+    critical_prices = solve_exercise_boundary(continuation, K, option_side, len(exercise_dates))
+    critical_prices[~fitted] = 0.0 if option_side == OptionSide.PUT else np.inf
+
+    return ExerciseBoundary(K, r, sigma, option_side, option_type, np.asarray(times), exercise_dates, critical_prices,
+                            model_tag="poly", poly_degree=poly_degree)
+
+
+def boundary_from_fnn(model, K: float, r: float, sigma: float, option_side: OptionSide,
+                      option_type: OptionType, times: np.ndarray, exercise_dates: np.ndarray,
+                      model_tag: str = "fnn") -> ExerciseBoundary:
+    """
+    Builds the boundary from a single asset LSMContinuationNN trained by fit_global_fnn
+
+    Boundaries from different FNNs of the same contract need distinct model tags to be cached side by side
+    """
+    import torch # only needed for FNN boundaries
+
+    exercise_dates = np.sort(np.asarray(exercise_dates, dtype=int))
+    times = np.asarray(times)
+    t_norm = (times[exercise_dates] / times[-1]).astype(np.float32)
+    device = next(model.parameters()).device
+
+    def continuation(S, date_index):
+        X = torch.from_numpy(np.column_stack((S.astype(np.float32), t_norm[date_index]))).to(device)
+        with torch.no_grad():
+            return model(X)[:, 0].cpu().numpy().astype(float)
+
+    critical_prices = solve_exercise_boundary(continuation, K, option_side, len(exercise_dates))
+    return ExerciseBoundary(K, r, sigma, option_side, option_type, times, exercise_dates, critical_prices,
+                            model_tag=model_tag)
+
+
+def boundary_price(S_paths: np.ndarray, boundary: ExerciseBoundary) -> float:
+    """
+    Values (M, N+1) paths with the exercise boundary alone, an O(M * dates) comparison with no model evaluation
+
+    The paths must be on the same time grid the boundary was solved on
+    """
+    M, N_plus_1 = S_paths.shape
+    N = N_plus_1 - 1
+    if N_plus_1 != len(boundary.times):
+        raise ValueError(f"Paths have {N_plus_1} columns but the boundary was solved on {len(boundary.times)}")
+
+    payoff = compute_payoff(S_paths, boundary.K, boundary.option_side)
+    exercise_time = np.full(M, N)
+    dates = boundary.exercise_dates
+
+    if len(dates) > 0:
+        S_dates = S_paths[:, dates]
+        if boundary.option_side == OptionSide.PUT:
+            hit = S_dates < boundary.critical_prices
+        else:
+            hit = S_dates > boundary.critical_prices
+        hit &= payoff[:, dates] > 0
+
+        # first exercise date on each path where the boundary is crossed
+        exercised = hit.any(axis=1)
+        exercise_time[exercised] = dates[hit[exercised].argmax(axis=1)]
+
+    cashflow = payoff[np.arange(M), exercise_time]
+    return np.mean(cashflow * np.exp(-boundary.r * boundary.times[exercise_time]))
+
+
+def lsm_boundary(S_paths: np.ndarray, K: float, r: float, sigma: float, dt: float, poly_degree: int,
+                 option_side: OptionSide, option_type: OptionType, exercise_points: Optional[np.ndarray],
+                 time_grid: Optional[np.ndarray] = None) -> float:
+    """
+    Prices with a cached exercise boundary, fitting it with lsm_traditional on these paths on a cache miss
+
+    Later calls for the same contract (any path set on the same grid) only compare prices to the boundary
+    """
+    N = S_paths.shape[1] - 1
+    times = dt * np.arange(N + 1) if time_grid is None else np.asarray(time_grid)
+    exercise_dates = np.flatnonzero(exercise_date_mask(N, option_type, exercise_points))
+
+    key = boundary_key(K, r, sigma, option_side, option_type, times, exercise_dates, "poly", poly_degree)
+    boundary = cached_boundary(key)
+
+    if boundary is None:
+        _, coefficients = lsm_traditional(S_paths, K, r, dt, poly_degree, option_side, option_type,
+                                          exercise_points, time_grid, return_coefficients=True)
+        boundary = cache_boundary(boundary_from_poly(coefficients, K, r, sigma, option_side, option_type,
+                                                     times, exercise_dates, poly_degree))
+
+    return boundary_price(S_paths, boundary)
@@ -1,6 +1,6 @@
 import numpy as np
 
-def generate_gbm_paths(S0, ir, sigma, T, N, M):
+def generate_gbm_paths(S0, ir, sigma, T, N, M, rng=None):
     """
     Generates geometric bronwian motion stock paths for a single asset
 
@@ -14,17 +14,19 @@ def generate_gbm_paths(S0, ir, sigma, T, N, M):
         T (float): Total time to maturity (in years)
         N (int): Number of discrete time steps
         M (int): Number of simulated paths
+        rng (np.random.Generator): Optional generator to draw from instead of the global numpy random state
 
     Returns:
         np.ndarray: A 2d numpy array of shape (M, N+1) where each row is a path, each column is a time step, and array[i][j] == a price at the given time
     """
+    normal = np.random.normal if rng is None else rng.normal
 
     dt = T / N # Time increment per step
     S_paths = np.zeros((M, N + 1)) # Init path matrix with all 0
     S_paths[:, 0] = S0 # Init all paths with the init price
 
     for i in range(1, N + 1):
-        z = np.random.normal(0, 1, M) # Sample std normal noise foreach path
+        z = normal(0, 1, M) # Sample std normal noise foreach path
 
         # Apply GBM equation S_t+1 = S_t * exp((mu - 0.5sigma^2)*dt + sigma * root(dt) * Z)
         S_paths[:, i] = S_paths[:, i - 1] * np.exp(
@@ -79,3 +81,74 @@ def generate_multidim_gbm_paths(S0, ir, sigma, corr_matrix, T, N, M):
         paths[:, t, :] = paths[:, t - 1, :] * np.exp(drift + diffusion)
 
     return paths
+
+
+
+def generate_gbm_paths_on_grid(S0, ir, sigma, times, M, rng=None):
+    """
+    Generates single asset GBM paths sampled only at the given times
+
+    GBM has an exact transition density, so jumping straight from one grid point to the next
+    with a variable dt has no discretization error. This lets a Bermudan be simulated on its
+    exercise dates plus maturity instead of on every step
+
+    Args:
+        S0 (float): Intial stock price
+        ir (float): risk-free interest rate (drift term)
+        sigma (float): Volatility of the underlying
+        times (np.ndarray): Increasing times (in years) to sample at, starting at 0. Shape: (K,)
+        M (int): Number of simulated paths
+        rng (np.random.Generator): Optional generator to draw from instead of the global numpy random state
+
+    Returns:
+        np.ndarray: A 2d numpy array of shape (M, K) where array[i][j] == the price at times[j]
+    """
+    normal = np.random.normal if rng is None else rng.normal
+
+    dts = np.diff(times) # Variable time increment between grid points
+    S_paths = np.zeros((M, len(times)))
+    S_paths[:, 0] = S0
+
+    for i, dt in enumerate(dts, start=1):
+        z = normal(0, 1, M)
+        S_paths[:, i] = S_paths[:, i - 1] * np.exp(
+            (ir - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * z
+        )
+
+    return S_paths
+
+
+
+def generate_multidim_gbm_paths_on_grid(S0, ir, sigma, corr_matrix, times, M):
+    """
+    Generates correlated multi-asset GBM paths sampled only at the given times (see generate_gbm_paths_on_grid)
+
+    Args:
+        S0 (np.ndarray): Init prices of each asset. Shape: (D,)
+        ir (np.ndarry): risk-free interest rate (drift term) of each asset. Shape: (D,)
+        sigma (np.ndarry): Volatility of each asset. Shape: (D,)
+        corr_matrix (np.ndarry): Correlation matrix between assets. Shape: (D,D)
+        times (np.ndarray): Increasing times (in years) to sample at, starting at 0. Shape: (K,)
+        M (int): Number of simulated paths
+
+    Returns:
+        np.ndarry: A 3d numpy array of shape (M, K, D)
+    """
+    D = len(S0)
+    dts = np.diff(times)
+
+    L = np.linalg.cholesky(corr_matrix)
+
+    paths = np.zeros((M, len(times), D))
+    paths[:, 0, :] = S0
+
+    for t, dt in enumerate(dts, start=1):
+        # Correlate one step of noise at a time so only (M, D) normals are held in memory
+        Z = np.random.normal(size=(M, D)) @ L.T
+
+        drift = (ir - 0.5 * sigma**2) * dt
+        diffusion = sigma * np.sqrt(dt) * Z
+
+        paths[:, t, :] = paths[:, t - 1, :] * np.exp(drift + diffusion)
+
+    return paths
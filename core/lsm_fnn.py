@@ -2,9 +2,13 @@ import numpy as np
 import torch
 import torch.nn as nn
 
-from enums import OptionSide, OptionType
+from enums import OptionSide, OptionType, PayoffStyle
 from .neural_net import LSMContinuationNN
-from typing import Optional
+from .nn_sizes import get_nn_sizes
+from .lsm_traditional import exercise_date_mask
+from .payoffs import compute_payoff
+from .parallel_training import train_data_parallel
+from typing import Optional, Tuple, Union
 
 
 def european_price(r: float, dt: float, N: int, payoff: np.ndarray) -> float:
@@ -13,73 +17,121 @@ def european_price(r: float, dt: float, N: int, payoff: np.ndarray) -> float:
     Only uses final payoffs at maturity.
     """
     discount_factor = np.exp(-r * dt * N)
-    option_price = np.mean(payoff) * discount_factor
+    option_price = np.mean(payoff[:, -1]) * discount_factor
 
     return option_price
 
 
-def lsm_global_fnn(S_paths: np.ndarray, K: float, r: float, dt: float, 
-                   option_side: OptionSide, option_type: OptionType, 
-                   exercise_points: Optional[np.ndarray], nn_layers: list, num_of_epochs: int) -> float:
+def num_features(d: int) -> int:
     """
-    This function creates only 1 global FNN trains the data on that then it makes its predictions
+    Width of the FNN input: [S, t] for one asset, [S_1..S_D, basket value, t] otherwise
+    """
+    return 2 if d == 1 else d + 2
+
+
+# Rows gathered per block in write_features, bounds the float64 temporary to GATHER_BLOCK * D values
+GATHER_BLOCK = 4096
+
+
+def write_features(out: np.ndarray, S_t: np.ndarray, rows: np.ndarray, t_norm: float,
+                   K: Optional[Union[float, np.ndarray]] = None):
     """
-    M, N_plus_1 = S_paths.shape
+    Writes the feature rows for the prices S_t[rows] into the preallocated float32 buffer out in place
+
+    S_t holds the prices of every path on one date, (M,) or (M, D). The selected rows are gathered
+    block by block straight into out, so no (len(rows), D) float64 copy is ever made.
+    If K is given the prices are written as moneyness S / K
+    """
+    D = 1 if S_t.ndim == 1 else S_t.shape[1]
+    prices = out[:, 0] if S_t.ndim == 1 else out[:, :D]
+
+    for start in range(0, len(rows), GATHER_BLOCK):
+        block = rows[start:start + GATHER_BLOCK]
+        prices[start:start + len(block)] = S_t[block]
+
+    if K is not None:
+        prices /= np.ravel(K)[0] if S_t.ndim == 1 else K
+    if S_t.ndim > 1:
+        np.mean(prices, axis=1, out=out[:, D]) # basket value
+    out[:, -1] = t_norm
+
+
+def build_training_set(S_paths: np.ndarray, payoff: np.ndarray, r: float, dt: float,
+                       option_type: OptionType, exercise_points: Optional[np.ndarray],
+                       time_grid: Optional[np.ndarray] = None,
+                       K: Optional[Union[float, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collects the features -> discounted cashflow training set for the global FNN
+
+    Training rows are only collected for in-the-money paths on the dates where early exercise is allowed.
+    Returns float32 arrays X of shape (rows, num_features(D)) and Y of shape (rows, 1).
+    If the strike(s) K are given the set is in moneyness: features S / K and targets Y / mean(K)
+    """
+    scale = 1.0 if K is None else float(np.mean(K))
+    M, N_plus_1 = S_paths.shape[:2]
     N = N_plus_1 - 1
-    d = 1 if S_paths.ndim == 2 else S_paths.shape[2] # multidimensions later
+    d = 1 if S_paths.ndim == 2 else S_paths.shape[2]
+    times = dt * np.arange(N_plus_1) if time_grid is None else np.asarray(time_grid)
+    exercise_dates = np.flatnonzero(exercise_date_mask(N, option_type, exercise_points))[::-1]
 
-    # Step 1: Compute intrisct value
-    if option_side == OptionSide.PUT:
-        payoff = np.maximum(K - S_paths, 0)
-    elif option_side == OptionSide.CALL:
-        payoff = np.maximum(S_paths - K, 0)
-    else:
-        raise ValueError("Option must either be put or call")
-    
+    # Initialize cashflow at expiry, no path is exercised early while collecting training data
+    cashflow = payoff[:, -1]
 
-    # Skip training and backward induction for European options — no early exercise allowed
-    if option_type == OptionType.EUROPEAN:
-        return european_price(r, dt, N, payoff)
-    
-    
-    # Initialize cashflow at expiry
-    cashflow = payoff[:, -1].copy()
-    exercise_time = np.full(M, N)
+    # Step 2: Collect training data (X = features, Y = discounted cashflow)
+    # Count the itm rows first so X and Y can be preallocated and filled in place
+    itm_by_date = [np.flatnonzero(payoff[:, t] > 0) for t in exercise_dates]
+    num_rows = sum(len(itm) for itm in itm_by_date)
 
-    # Step 2: Collect training data (X = [S_t, t], Y = discounted cashflow)
-    X_all = []
-    Y_all = []
+    if num_rows == 0:
+        raise ValueError("No in-the-money paths on any exercise date to train the FNN on")
 
-    for t in range(N - 1, 0, -1):
-        alive = np.where(exercise_time > t)[0]
-        if len(alive) == 0:
-            continue
+    X_all = np.empty((num_rows, num_features(d)), dtype=np.float32)
+    Y_all = np.empty((num_rows, 1), dtype=np.float32)
 
-        itm_mask = payoff[alive, t] > 0
-        if np.sum(itm_mask) == 0:
+    row = 0
+    for t, itm_indices in zip(exercise_dates, itm_by_date):
+        n = len(itm_indices)
+        if n == 0:
             continue
-        itm_indices = alive[itm_mask]
 
-        S_t = S_paths[itm_indices, t]
-        t_norm = t / N
+        write_features(X_all[row:row + n], S_paths[:, t], itm_indices, times[t] / times[-1], K)
+        np.multiply(cashflow[itm_indices], np.exp(-r * (times[-1] - times[t])) / scale, out=Y_all[row:row + n, 0], casting="same_kind")
+        row += n
 
-        # For 1D input: shape [n, 2]
-        X_t = np.column_stack((S_t, np.full_like(S_t, t_norm)))
-        Y_t = cashflow[itm_indices] * np.exp(-r * dt * (exercise_time[itm_indices] - t))
+    return X_all, Y_all
+
+
+def fit_global_fnn(S_paths: np.ndarray, payoff: np.ndarray, r: float, dt: float,
+                   option_type: OptionType, exercise_points: Optional[np.ndarray],
+                   nn_layers: Optional[list], num_of_epochs: int,
+                   time_grid: Optional[np.ndarray] = None, num_workers: int = 1,
+                   K: Optional[Union[float, np.ndarray]] = None) -> LSMContinuationNN:
+    """
+    Builds the training set and fits the global FNN
 
-        X_all.append(X_t)
-        Y_all.append(Y_t)
+    Split out of lsm_global_fnn so a trained model can be kept and reused on the same paths.
+    If nn_layers is None the network is sized with get_nn_sizes(D).
+    With num_workers > 1 and no gpu, training is data-parallel across CPU processes (see train_data_parallel).
+    Passing the strike(s) K trains on moneyness (see build_training_set)
+    """
+    d = 1 if S_paths.ndim == 2 else S_paths.shape[2]
+    if nn_layers is None:
+        nn_layers = get_nn_sizes(d)
 
-    X_all = np.vstack(X_all)
-    Y_all = np.hstack(Y_all).reshape(-1, 1)
+    X_all, Y_all = build_training_set(S_paths, payoff, r, dt, option_type, exercise_points, time_grid, K)
 
-    X_tensor = torch.tensor(X_all, dtype=torch.float32)
-    Y_tensor = torch.tensor(Y_all, dtype=torch.float32)
+    X_tensor = torch.from_numpy(X_all)
+    Y_tensor = torch.from_numpy(Y_all)
 
 
     # Device to support gpu
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+    if num_workers > 1 and device.type == "cpu":
+        model, _ = train_data_parallel(X_tensor, Y_tensor, nn_layers, num_of_epochs, num_workers)
+        model.eval()
+        return model
+
     # Move data to gpu if available
     X_tensor = X_tensor.to(device)
     Y_tensor = Y_tensor.to(device)
@@ -97,12 +149,61 @@ def lsm_global_fnn(S_paths: np.ndarray, K: float, r: float, dt: float,
         loss.backward()
         optimizer.step()
 
+    model.eval()
+    return model
+
+
+def lsm_global_fnn(S_paths: np.ndarray, K: Union[float, np.ndarray], r: float, dt: float, 
+                   option_side: OptionSide, option_type: OptionType, 
+                   exercise_points: Optional[np.ndarray], nn_layers: Optional[list], num_of_epochs: int,
+                   model: Optional[LSMContinuationNN] = None,
+                   time_grid: Optional[np.ndarray] = None,
+                   payoff_style: Optional[PayoffStyle] = None,
+                   num_workers: int = 1, moneyness: bool = False) -> float:
+    """
+    This function creates only 1 global FNN trains the data on that then it makes its predictions
+
+    Accepts (M, N+1) paths with a single strike or (M, N+1, D) paths with per-asset strikes,
+    combined according to payoff_style (see compute_payoff).
+    If an already trained model is passed in, training is skipped and only the backward induction runs.
+    Paths simulated on a non-uniform schedule pass their times in years as time_grid (see lsm_traditional).
+    num_workers > 1 trains the FNN data-parallel across CPU processes.
+    With moneyness the FNN is trained on (and a passed in model must have been trained on) S / K
+    """
+    M, N_plus_1 = S_paths.shape[:2]
+    N = N_plus_1 - 1
+    times = dt * np.arange(N_plus_1) if time_grid is None else np.asarray(time_grid)
+    d = 1 if S_paths.ndim == 2 else S_paths.shape[2]
+
+    # Step 1: Compute intrisct value
+    payoff = compute_payoff(S_paths, K, option_side, payoff_style)
+
+    # Dates where early exercise is allowed, latest first
+    exercise_dates = np.flatnonzero(exercise_date_mask(N, option_type, exercise_points))[::-1]
+
+    # Skip training and backward induction for European options, and whenever no path is itm on an
+    # early exercise date (none to train on, none can exercise early), which covers having no such date
+    if option_type == OptionType.EUROPEAN or not (payoff[:, exercise_dates] > 0).any():
+        # dt * N == times[-1], so this discounts from maturity on any time grid
+        return european_price(r, times[-1] / N, N, payoff)
+    
+    if model is None:
+        model = fit_global_fnn(S_paths, payoff, r, dt, option_type, exercise_points,
+                               nn_layers, num_of_epochs, time_grid, num_workers, K if moneyness else None)
+
+    device = next(model.parameters()).device
+
 
     # Step 4: Re-run backward induction using trained model
     cashflow = payoff[:, -1].copy()
     exercise_time = np.full(M, N)
 
-    for t in range(N - 1, 0, -1):
+    # One feature buffer reused for every date, only the first n (itm) rows are written
+    X_buffer = np.empty((M, num_features(d)), dtype=np.float32)
+    feature_K = K if moneyness else None
+    scale = float(np.mean(K)) if moneyness else 1.0
+
+    for t in exercise_dates:
         alive = np.where(exercise_time > t)[0]
         if len(alive) == 0:
             continue
@@ -111,13 +212,13 @@ def lsm_global_fnn(S_paths: np.ndarray, K: float, r: float, dt: float,
         if np.sum(itm_mask) == 0:
             continue
         itm_indices = alive[itm_mask]
+        n = len(itm_indices)
 
-        S_t = S_paths[itm_indices, t]
-        t_norm = t / N
-        X_pred = torch.tensor(np.column_stack((S_t, np.full_like(S_t, t_norm))), dtype=torch.float32).to(device)
+        write_features(X_buffer[:n], S_paths[:, t], itm_indices, times[t] / times[-1], feature_K)
+        X_pred = torch.from_numpy(X_buffer[:n]).to(device)
 
         with torch.no_grad():
-            continuation_value = model(X_pred).squeeze().cpu().numpy()
+            continuation_value = scale * model(X_pred)[:, 0].cpu().numpy()
 
         immediate_exercise = payoff[itm_indices, t]
         exercise_now = immediate_exercise > continuation_value
@@ -127,7 +228,7 @@ def lsm_global_fnn(S_paths: np.ndarray, K: float, r: float, dt: float,
         exercise_time[exercise_indices] = t
 
     # Step 5: Discount to present
-    option_values = cashflow * np.exp(-r * dt * exercise_time)
+    option_values = cashflow * np.exp(-r * times[exercise_time])
     return np.mean(option_values)
 
 
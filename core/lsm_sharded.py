@@ -0,0 +1,134 @@
+import multiprocessing as mp
+import os
+import traceback
+import numpy as np
+
+from enums import OptionSide, OptionType
+from typing import Optional
+
+from .gbm import generate_gbm_paths_on_grid
+from .lsm_traditional import exercise_date_mask
+from .payoffs import compute_payoff
+
+
+def _shard_worker(conn, S0: float, K: float, r: float, sigma: float, times: np.ndarray, M: int,
+                  poly_degree: int, option_side: OptionSide, exercise_dates: np.ndarray,
+                  seed_seq: np.random.SeedSequence):
+    """
+    Owns one shard of paths for the whole backward induction, only sufficient statistics leave the process
+
+    Protocol, per exercise date (latest first):
+        worker -> parent: (X^T X, X^T y, number of itm paths)
+        parent -> worker: regression coefficients, or None to skip the date
+    Then worker -> parent: (sum of discounted cashflows, number of paths)
+    """
+    try:
+        rng = np.random.default_rng(seed_seq)
+        S_paths = generate_gbm_paths_on_grid(S0, r, sigma, times, M, rng=rng)
+        N = len(times) - 1
+
+        payoff = compute_payoff(S_paths, K, option_side)
+        cashflow = payoff[:, -1].copy()
+        exercise_time = np.full(M, N)
+
+        for t in exercise_dates:
+            alive = np.where(exercise_time > t)[0]
+            itm_indices = alive[payoff[alive, t] > 0]
+
+            # Regress on moneyness S/K so the normal equations stay well conditioned
+            X = np.vander(S_paths[itm_indices, t] / K, poly_degree + 1)
+            Y = cashflow[itm_indices] * np.exp(-r * (times[exercise_time[itm_indices]] - times[t]))
+
+            conn.send((X.T @ X, X.T @ Y, len(itm_indices)))
+            coeffs = conn.recv()
+            if coeffs is None:
+                continue
+
+            continuation_value = X @ coeffs
+            immediate_exercise = payoff[itm_indices, t]
+            exercise_now = immediate_exercise > continuation_value
+
+            exercise_indices = itm_indices[exercise_now]
+            cashflow[exercise_indices] = immediate_exercise[exercise_now]
+            exercise_time[exercise_indices] = t
+
+        option_values = cashflow * np.exp(-r * times[exercise_time])
+        conn.send((option_values.sum(), M))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _recv(conn):
+    message = conn.recv()
+    if isinstance(message, tuple) and len(message) == 2 and isinstance(message[0], str) and message[0] == "error":
+        raise RuntimeError(f"LSM shard worker failed:\n{message[1]}")
+    return message
+
+
+def lsm_sharded(S0: float, K: float, r: float, sigma: float, T: float, N: int, M: int, poly_degree: int,
+                option_side: OptionSide, option_type: OptionType, exercise_points: Optional[np.ndarray],
+                num_workers: Optional[int] = None, seed: Optional[int] = None,
+                time_grid: Optional[np.ndarray] = None) -> float:
+    """
+    Polynomial LSM where the M paths are split across worker processes and never gathered in one place
+
+    Each worker simulates its own shard from an independent seed stream. At every exercise date, latest first,
+    the workers send their per-shard X^T X and X^T y, the parent sums them, solves for the coefficients and
+    sends them back, and every worker applies the same exercise rule to its shard. Only the per-date sufficient
+    statistics and the final per-shard sums cross process boundaries, so M scales with cores and memory
+
+    Paths are simulated on time_grid (times in years) if given, otherwise on N steps of T / N.
+    The workers are spawned, so a script calling this needs the usual if __name__ == "__main__" guard
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, M))
+    times = T / N * np.arange(N + 1) if time_grid is None else np.asarray(time_grid)
+    N = len(times) - 1
+
+    exercise_dates = np.flatnonzero(exercise_date_mask(N, option_type, exercise_points))[::-1]
+    shard_sizes = [len(shard) for shard in np.array_split(np.arange(M), num_workers)]
+    seed_seqs = np.random.SeedSequence(seed).spawn(num_workers)
+
+    # Spawn rather than fork, the caller may be a worker thread of a process that already runs other threads
+    # (the service's pool, torch's intra-op threads) and forking a multithreaded process can deadlock the child
+    ctx = mp.get_context("spawn")
+
+    connections = []
+    workers = []
+    for shard_size, seed_seq in zip(shard_sizes, seed_seqs):
+        parent_conn, child_conn = ctx.Pipe()
+        worker = ctx.Process(target=_shard_worker,
+                            args=(child_conn, S0, K, r, sigma, times, shard_size, poly_degree,
+                                  option_side, exercise_dates, seed_seq),
+                            daemon=True)
+        worker.start()
+        child_conn.close() # so a crashed worker shows up as EOFError instead of a hang
+        connections.append(parent_conn)
+        workers.append(worker)
+
+    try:
+        # Backward induction in lockstep, reduce the sufficient statistics and broadcast the solution
+        for t in exercise_dates:
+            stats = [_recv(conn) for conn in connections]
+            XtX = sum(s[0] for s in stats)
+            XtY = sum(s[1] for s in stats)
+            num_itm = sum(s[2] for s in stats)
+
+            # Same guard as lsm_traditional, too few itm paths to fit the polynomial
+            coeffs = None
+            if num_itm >= 4:
+                coeffs = np.linalg.lstsq(XtX, XtY, rcond=None)[0]
+
+            for conn in connections:
+                conn.send(coeffs)
+
+        totals = [_recv(conn) for conn in connections]
+    finally:
+        for conn in connections:
+            conn.close()
+        for worker in workers:
+            worker.join()
+
+    return sum(total for total, _ in totals) / sum(count for _, count in totals)
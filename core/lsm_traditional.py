@@ -1,6 +1,6 @@
 import numpy as np
 from enums import OptionType, OptionSide
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple, Union
 
 def should_exercise_early(t: int, option_style: OptionType, excercise_pts: Optional[np.ndarray]) -> bool:
     if option_style == OptionType.AMERICAN:
@@ -10,13 +10,45 @@ def should_exercise_early(t: int, option_style: OptionType, excercise_pts: Optio
     return False
 
 
+def exercise_date_mask(N: int, option_style: OptionType, excercise_pts: Optional[np.ndarray]) -> np.ndarray:
+    """
+    Boolean mask of shape (N+1,) marking the interior steps (1..N-1) where early exercise is allowed
+    """
+    mask = np.zeros(N + 1, dtype=bool)
+
+    if option_style == OptionType.AMERICAN:
+        mask[1:N] = True
+    elif option_style == OptionType.BERMUDAN and excercise_pts is not None:
+        pts = np.asarray(excercise_pts, dtype=int)
+        mask[pts[(pts > 0) & (pts < N)]] = True
+
+    return mask
+
+
 def lsm_traditional(S_paths: np.ndarray, K: float, r: float, dt: float, poly_degree: int, 
                     option_side: OptionSide, option_type: OptionType, 
-                    exercise_points: Optional[np.ndarray]) -> float:
-    
+                    exercise_points: Optional[np.ndarray], time_grid: Optional[np.ndarray] = None,
+                    return_coefficients: bool = False, moneyness: bool = False,
+                    coefficients: Optional[Dict[int, np.ndarray]] = None) -> Union[float, Tuple[float, Dict[int, np.ndarray]]]:
+    """
+    Prices an option with the polynomial regression Longstaff-Schwartz method
+
+    By default column j of S_paths is at time j * dt. Paths simulated on a non-uniform schedule
+    (e.g. only the Bermudan exercise dates) pass their times in years as time_grid instead,
+    with exercise_points given as column indices into that grid
+
+    With return_coefficients the fitted polynomial (np.polyfit order) of every date a regression
+    was run on is returned too, as (price, {column index: coeffs})
+
+    With moneyness the regression is of Y / K on S / K, so the fitted polynomials do not depend on the
+    price level. Passing previously fitted coefficients skips the regression and only runs the backward sweep
+    """
     M, N_plus_1 = S_paths.shape
     N = N_plus_1 - 1
 
+    # time in years of each column, used for discounting
+    times = dt * np.arange(N_plus_1) if time_grid is None else np.asarray(time_grid)
+
     # find payoff of each path
     if option_side == OptionSide.PUT:
         payoff = np.maximum(K - S_paths, 0)
@@ -31,6 +63,14 @@ def lsm_traditional(S_paths: np.ndarray, K: float, r: float, dt: float, poly_deg
     # time index on exercise
     exercise_time = np.full(M, N)
 
+    # fitted regression per date
+    fit = coefficients is None
+    if fit:
+        coefficients = {}
+
+    # regress on S / K and Y / K when fitting in moneyness
+    scale = K if moneyness else 1.0
+
     # backwards induction
     for t in range(N - 1, 0, -1):
         if not should_exercise_early(t, option_type, exercise_points):
@@ -48,20 +88,22 @@ def lsm_traditional(S_paths: np.ndarray, K: float, r: float, dt: float, poly_deg
 
         itm_indices = alive[itm_mask]
 
-        # future discounted cash flows
-        Y = cashflow[itm_indices] * np.exp(-r * dt * (exercise_time[itm_indices] - t))
-
         # current asset prices (itm only)
-        X = S_paths[itm_indices, t]
+        X = S_paths[itm_indices, t] / scale
 
         # ran into issues when there were too few asset prices in the money
-        if len(X) < 4:
+        if fit and len(X) < 4:
             continue
 
         # regress future discounted cash flows onto asset price at present w/ polynomial regression
         # This is the part of the algo that has been swapped out for NN
-        coeffs = np.polyfit(X, Y, poly_degree)
-        continuation_value = np.polyval(coeffs, X)
+        if fit:
+            # future discounted cash flows
+            Y = cashflow[itm_indices] * np.exp(-r * (times[exercise_time[itm_indices]] - times[t]))
+            coefficients[t] = np.polyfit(X, Y / scale, poly_degree)
+        elif t not in coefficients:
+            continue
+        continuation_value = scale * np.polyval(coefficients[t], X)
 
         # value of option at present
         immediate_exercise = payoff[itm_indices, t]
@@ -75,7 +117,78 @@ def lsm_traditional(S_paths: np.ndarray, K: float, r: float, dt: float, poly_deg
         exercise_time[exercise_indices] = t
 
     # discount cash flows from exercise to t=0
-    option_values = cashflow * np.exp(-r * dt * exercise_time)
+    option_values = cashflow * np.exp(-r * times[exercise_time])
     option_price = np.mean(option_values)
 
-    return option_price
\ No newline at end of file
+    if return_coefficients:
+        return option_price, coefficients
+
+    return option_price
+
+def lsm_traditional_batch(S_paths: np.ndarray, K: Sequence[float], r: float, dt: float, poly_degree: int,
+                          option_side: Sequence[OptionSide], option_type: OptionType,
+                          exercise_points: Optional[np.ndarray], time_grid: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Prices C single asset contracts that share paths and an exercise schedule in one backward sweep
+
+    Contract c has strike K[c] and side option_side[c]. Every date is visited once for all contracts: the
+    payoffs, exercise decisions and cashflows are stacked as (C, M) arrays, and the C regressions are solved
+    together from their normal equations in moneyness S / K[c] (the same fit as lsm_traditional, whose
+    fitted values do not depend on that scaling)
+
+    Returns:
+        np.ndarray: Price of each contract. Shape: (C,)
+    """
+    M, N_plus_1 = S_paths.shape
+    N = N_plus_1 - 1
+    times = dt * np.arange(N_plus_1) if time_grid is None else np.asarray(time_grid)
+
+    K = np.asarray(K, dtype=float)
+    if any(side not in (OptionSide.PUT, OptionSide.CALL) for side in option_side):
+        raise ValueError("option_type must be 'put' or 'call'")
+    sign = np.array([1.0 if side == OptionSide.CALL else -1.0 for side in option_side])[:, None]
+
+    def payoff_at(t):
+        return np.maximum(sign * (S_paths[:, t] - K[:, None]), 0)
+
+    cashflow = payoff_at(N)
+    exercise_time = np.full((len(K), M), N)
+    num_coeffs = poly_degree + 1
+    hankel = np.add.outer(np.arange(num_coeffs), np.arange(num_coeffs))[::-1, ::-1] # power of x in X^T X, np.polyfit order
+
+    for t in np.flatnonzero(exercise_date_mask(N, option_type, exercise_points))[::-1]:
+        payoff = payoff_at(t)
+        itm = (exercise_time > t) & (payoff > 0)
+        num_itm = itm.sum(axis=1)
+
+        # Same guard as lsm_traditional, too few itm paths to fit the polynomial
+        fitted = num_itm >= 4
+        if not fitted.any():
+            continue
+
+        x = S_paths[:, t] / K[:, None]
+        Y = np.where(itm, cashflow * np.exp(-r * (times[exercise_time] - times[t])), 0.0)
+
+        # Normal equations from power sums over the itm paths, sum(x^k) for k <= 2 * degree and sum(x^k * Y)
+        x_power = itm.astype(float)
+        moments = np.empty((len(K), 2 * num_coeffs - 1))
+        XtY = np.empty((len(K), num_coeffs))
+        for k in range(2 * num_coeffs - 1):
+            moments[:, k] = x_power.sum(axis=1)
+            if k < num_coeffs:
+                XtY[:, num_coeffs - 1 - k] = (x_power * Y).sum(axis=1)
+            x_power *= x
+
+        coeffs = (np.linalg.pinv(moments[:, hankel]) @ XtY[:, :, None])[:, :, 0]
+
+        # Horner's rule with a different polynomial per contract
+        continuation_value = np.zeros_like(x)
+        for j in range(num_coeffs):
+            continuation_value = continuation_value * x + coeffs[:, j:j + 1]
+
+        exercise_now = itm & fitted[:, None] & (payoff > continuation_value)
+
+        cashflow[exercise_now] = payoff[exercise_now]
+        exercise_time[exercise_now] = t
+
+    return np.mean(cashflow * np.exp(-r * times[exercise_time]), axis=1)
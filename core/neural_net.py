@@ -2,6 +2,8 @@ import torch
 import torch.nn as nn
 from typing import List
 
+from .nn_sizes import get_nn_sizes # re-exported, kept torch-free so config can import it cheaply
+
 
 # Feedforward Neural Network (FNN), also known as a Multilayer Perceptron (MLP)
 class LSMContinuationNN(nn.Module):
@@ -25,17 +27,3 @@ class LSMContinuationNN(nn.Module):
     
     def forward(self, x):
         return self.model(x)
-
-
-def get_nn_sizes(d: int) -> int:
-    """
-    Returns hidden layer sizes based on the number of dimensions d.
-    """
-    if d <= 4:
-        return [32, 16, 8]
-    elif d <= 11:
-        return [64, 32, 16]
-    elif d <= 20:
-        return [128, 64, 32]
-    else:
-        return [256, 128, 64]
\ No newline at end of file
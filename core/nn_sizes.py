@@ -0,0 +1,12 @@
+def get_nn_sizes(d: int) -> int:
+    """
+    Returns hidden layer sizes based on the number of dimensions d.
+    """
+    if d <= 4:
+        return [32, 16, 8]
+    elif d <= 11:
+        return [64, 32, 16]
+    elif d <= 20:
+        return [128, 64, 32]
+    else:
+        return [256, 128, 64]
\ No newline at end of file
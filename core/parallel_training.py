@@ -0,0 +1,117 @@
+import os
+import socket
+import time
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as tmp
+import torch.nn as nn
+from torch.nn.parallel import DistributedDataParallel
+
+from .neural_net import LSMContinuationNN
+from typing import List, Optional, Tuple
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _train_worker(rank: int, world_size: int, init_method: str, X: torch.Tensor, Y: torch.Tensor,
+                  shared_model: LSMContinuationNN, nn_layers: List[int], num_of_epochs: int,
+                  threads_per_worker: int, lr: float, target_loss: Optional[float], history: torch.Tensor):
+    """
+    Trains on this rank's slice of the shared training set, gradients are averaged across ranks by DDP
+    """
+    # Pin intra-op threads so the workers don't oversubscribe the cores
+    torch.set_num_threads(threads_per_worker)
+    dist.init_process_group("gloo", init_method=init_method, rank=rank, world_size=world_size)
+
+    try:
+        # Every rank starts from the same weights
+        model = LSMContinuationNN(X.shape[1], nn_layers)
+        model.load_state_dict(shared_model.state_dict())
+        ddp_model = DistributedDataParallel(model)
+
+        # Views into shared memory, no copy of the training set
+        X_local = torch.tensor_split(X, world_size)[rank]
+        Y_local = torch.tensor_split(Y, world_size)[rank]
+        weight = torch.tensor([len(X_local) / len(X)], dtype=torch.float32)
+
+        optimizer = torch.optim.Adam(ddp_model.parameters(), lr=lr)
+        loss_fn = nn.MSELoss()
+
+        dist.barrier()
+        start = time.perf_counter()
+
+        for epoch in range(num_of_epochs):
+            ddp_model.train()
+            optimizer.zero_grad()
+            pred = ddp_model(X_local)
+            loss = loss_fn(pred, Y_local)
+            loss.backward() # DDP all-reduces (averages) the gradients here
+            optimizer.step()
+
+            # Loss over the whole training set, identical on every rank so they all stop together
+            global_loss = loss.detach() * weight
+            dist.all_reduce(global_loss)
+
+            if rank == 0:
+                history[epoch, 0] = global_loss.item()
+                history[epoch, 1] = time.perf_counter() - start
+
+            if target_loss is not None and global_loss.item() <= target_loss:
+                break
+
+        if rank == 0:
+            with torch.no_grad():
+                for shared_param, param in zip(shared_model.parameters(), model.parameters()):
+                    shared_param.copy_(param)
+    finally:
+        dist.destroy_process_group()
+
+
+def train_data_parallel(X: torch.Tensor, Y: torch.Tensor, nn_layers: List[int], num_of_epochs: int,
+                        num_workers: int, threads_per_worker: Optional[int] = None, lr: float = 0.01,
+                        target_loss: Optional[float] = None) -> Tuple[LSMContinuationNN, np.ndarray]:
+    """
+    Trains an LSMContinuationNN with full-batch Adam, data-parallel across CPU worker processes
+
+    The training set is moved into shared memory and each worker trains on a contiguous slice of it.
+    Gradients are averaged with torch.distributed on the gloo backend, so every epoch is one
+    full-batch step on the whole training set, as in fit_global_fnn
+
+    Args:
+        X (torch.Tensor): Features. Shape: (rows, F)
+        Y (torch.Tensor): Targets. Shape: (rows, 1)
+        nn_layers (List[int]): Hidden layer sizes
+        num_of_epochs (int): Maximum number of epochs
+        num_workers (int): Number of worker processes
+        threads_per_worker (int): Intra-op threads per worker, defaults to splitting the cores evenly
+        lr (float): Adam learning rate
+        target_loss (float): Stop once the full training set MSE is at or below this value
+
+    Returns:
+        Tuple[LSMContinuationNN, np.ndarray]: The trained model and, per epoch run, (loss, seconds since training started)
+    """
+    if threads_per_worker is None:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // num_workers)
+
+    X = X.float().contiguous().share_memory_()
+    Y = Y.float().contiguous().share_memory_()
+
+    model = LSMContinuationNN(X.shape[1], nn_layers)
+    model.share_memory()
+
+    history = torch.full((num_of_epochs, 2), float("nan"))
+    history.share_memory_()
+
+    init_method = f"tcp://127.0.0.1:{_free_port()}"
+    tmp.spawn(_train_worker,
+              args=(num_workers, init_method, X, Y, model, nn_layers, num_of_epochs,
+                    threads_per_worker, lr, target_loss, history),
+              nprocs=num_workers, join=True)
+
+    history = history.numpy()
+    return model, history[~np.isnan(history[:, 0])]
@@ -0,0 +1,57 @@
+import numpy as np
+from enums import OptionSide, PayoffStyle
+from typing import Optional, Union
+
+
+def basket_value(S: np.ndarray) -> np.ndarray:
+    """
+    Equal weighted basket value over the last (asset) axis
+    """
+    return S.mean(axis=-1)
+
+
+def compute_payoff(S_paths: np.ndarray, K: Union[float, np.ndarray], option_side: OptionSide,
+                   payoff_style: Optional[PayoffStyle] = None) -> np.ndarray:
+    """
+    Computes the intrinsic value of every path at every time step
+
+    Args:
+        S_paths (np.ndarray): Paths of shape (M, N+1) for one asset or (M, N+1, D) for D assets
+        K (float | np.ndarray): Strike, or per-asset strikes of shape (D,) for multi-asset paths
+        option_side (OptionSide): Put or call
+        payoff_style (PayoffStyle): How multi-asset payoffs are combined, defaults to BASKET
+
+    Returns:
+        np.ndarray: Payoffs of shape (M, N+1)
+    """
+    if option_side not in (OptionSide.PUT, OptionSide.CALL):
+        raise ValueError("Option must either be put or call")
+
+    sign = 1.0 if option_side == OptionSide.CALL else -1.0
+
+    if S_paths.ndim == 2:
+        if np.size(K) != 1:
+            raise ValueError(f"Expected 1 strike price for single asset paths, got {np.size(K)}")
+        K = float(np.ravel(K)[0])
+        return np.maximum(sign * (S_paths - K), 0)
+
+    K = np.asarray(K, dtype=float)
+    D = S_paths.shape[2]
+    if K.shape != (D,):
+        raise ValueError(f"Expected {D} strike prices, got shape {K.shape}")
+
+    payoff_style = payoff_style or PayoffStyle.BASKET
+
+    if payoff_style == PayoffStyle.BASKET:
+        return np.maximum(sign * (basket_value(S_paths) - K.mean()), 0)
+
+    if payoff_style not in (PayoffStyle.MAX, PayoffStyle.MIN):
+        raise ValueError(f"Unknown payoff style: {payoff_style}")
+
+    # Combine one asset at a time so only (M, N+1) arrays are ever allocated
+    combine = np.maximum if payoff_style == PayoffStyle.MAX else np.minimum
+    payoff = np.maximum(sign * (S_paths[:, :, 0] - K[0]), 0)
+    for i in range(1, D):
+        combine(payoff, np.maximum(sign * (S_paths[:, :, i] - K[i]), 0), out=payoff)
+
+    return payoff
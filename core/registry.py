@@ -0,0 +1,168 @@
+import importlib
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from .gbm import generate_gbm_paths, generate_multidim_gbm_paths
+from .gbm import generate_gbm_paths_on_grid, generate_multidim_gbm_paths_on_grid
+
+
+@dataclass(frozen=True)
+class PricerSpec:
+    """
+    A pricing method that can be selected by name from config.yaml or the command line
+
+    The backend module is only imported when the pricer is loaded, so selecting a
+    polynomial or binomial pricer never imports torch
+
+    A pricer with a batch_function can value several contracts on the same paths in one call.
+    It takes the same arguments as function, except that the ones named in batch_args are
+    sequences with one entry per contract
+    """
+    name: str
+    module: str
+    function: str
+    build_args: Callable[..., dict]
+    needs_paths: bool = True
+    description: str = ""
+    batch_function: Optional[str] = None
+    batch_args: Tuple[str, ...] = ()
+
+    def load(self) -> Callable:
+        return getattr(importlib.import_module(self.module), self.function)
+
+    def load_batch(self) -> Callable:
+        return getattr(importlib.import_module(self.module), self.batch_function)
+
+    def price(self, cfg, S_paths: Optional[np.ndarray] = None, **kwargs) -> float:
+        if self.needs_paths and S_paths is None:
+            raise ValueError(f"Pricer {self.name} requires simulated paths")
+        return self.load()(**self.build_args(cfg, S_paths), **kwargs)
+
+
+PRICERS: Dict[str, PricerSpec] = {}
+
+
+def register_pricer(spec: PricerSpec) -> PricerSpec:
+    PRICERS[spec.name] = spec
+    return spec
+
+
+def get_pricer(name: str) -> PricerSpec:
+    if name not in PRICERS:
+        raise ValueError(f"Unknown pricer: {name}, expected one of {sorted(PRICERS)}")
+    return PRICERS[name]
+
+
+def simulate_paths(cfg) -> np.ndarray:
+    """
+    Generates the GBM paths described by a Config, (M, N+1) for one asset or (M, N+1, D) otherwise
+
+    With exercise_dates_only the paths are sampled on cfg.time_grid instead, (M, K) or (M, K, D)
+    """
+    if cfg.time_grid is not None:
+        if cfg.dimensions == 1:
+            return generate_gbm_paths_on_grid(
+                S0=cfg.init_stock_prices[0],
+                ir=cfg.risk_free_interest,
+                sigma=cfg.volatilities[0],
+                times=cfg.time_grid,
+                M=cfg.num_of_paths
+            )
+
+        return generate_multidim_gbm_paths_on_grid(
+            S0=cfg.init_stock_prices,
+            ir=cfg.risk_free_interest,
+            sigma=cfg.volatilities,
+            corr_matrix=cfg.correlation_matrix,
+            times=cfg.time_grid,
+            M=cfg.num_of_paths
+        )
+
+    if cfg.dimensions == 1:
+        return generate_gbm_paths(
+            S0=cfg.init_stock_prices[0],
+            ir=cfg.risk_free_interest,
+            sigma=cfg.volatilities[0],
+            T=cfg.time_to_exp,
+            N=cfg.num_of_steps,
+            M=cfg.num_of_paths
+        )
+
+    return generate_multidim_gbm_paths(
+        S0=cfg.init_stock_prices,
+        ir=cfg.risk_free_interest,
+        sigma=cfg.volatilities,
+        corr_matrix=cfg.correlation_matrix,
+        T=cfg.time_to_exp,
+        N=cfg.num_of_steps,
+        M=cfg.num_of_paths
+    )
+
+
+def _require_single_asset(cfg, name: str):
+    if cfg.dimensions != 1:
+        raise ValueError(f"Pricer {name} only supports a single underlying, got dimensions={cfg.dimensions}")
+
+
+def _schedule_args(cfg) -> dict:
+    # Paths on the exercise grid index exercise points by grid column, not by step
+    if cfg.time_grid is not None:
+        return dict(exercise_points=cfg.grid_exercise_points, time_grid=cfg.time_grid)
+    return dict(exercise_points=cfg.exercise_points)
+
+
+def _binomial_args(cfg, S_paths):
+    _require_single_asset(cfg, "binomial")
+    return dict(S0=cfg.init_stock_prices[0], K=cfg.strike_prices[0], T=cfg.time_to_exp,
+                r=cfg.risk_free_interest, sigma=cfg.volatilities[0], N=cfg.num_of_steps,
+                option_side=cfg.option_side, option_type=cfg.option_type,
+                exercise_points=cfg.exercise_points)
+
+
+def _lsm_poly_args(cfg, S_paths):
+    _require_single_asset(cfg, "lsm_poly")
+    return dict(S_paths=S_paths, K=cfg.strike_prices[0], r=cfg.risk_free_interest, dt=cfg.time_step,
+                poly_degree=cfg.poly_degree, option_side=cfg.option_side, option_type=cfg.option_type,
+                **_schedule_args(cfg))
+
+
+def _strikes(cfg):
+    # Multi-asset pricers take the per-asset strikes
+    return cfg.strike_prices[0] if cfg.dimensions == 1 else cfg.strike_prices
+
+
+def _lsm_fnn_args(cfg, S_paths):
+    return dict(S_paths=S_paths, K=_strikes(cfg), r=cfg.risk_free_interest, dt=cfg.time_step,
+                option_side=cfg.option_side, option_type=cfg.option_type,
+                nn_layers=cfg.nn_layers, num_of_epochs=cfg.epochs, payoff_style=cfg.payoff_style,
+                num_workers=cfg.num_workers, **_schedule_args(cfg))
+
+
+def _lsm_boundary_args(cfg, S_paths):
+    _require_single_asset(cfg, "lsm_boundary")
+    return dict(S_paths=S_paths, K=cfg.strike_prices[0], r=cfg.risk_free_interest, sigma=cfg.volatilities[0],
+                dt=cfg.time_step, poly_degree=cfg.poly_degree, option_side=cfg.option_side,
+                option_type=cfg.option_type, **_schedule_args(cfg))
+
+
+def _lsm_poly_sharded_args(cfg, S_paths):
+    _require_single_asset(cfg, "lsm_poly_sharded")
+    return dict(S0=cfg.init_stock_prices[0], K=cfg.strike_prices[0], r=cfg.risk_free_interest,
+                sigma=cfg.volatilities[0], T=cfg.time_to_exp, N=cfg.num_of_steps, M=cfg.num_of_paths,
+                poly_degree=cfg.poly_degree, option_side=cfg.option_side, option_type=cfg.option_type,
+                num_workers=cfg.num_workers, **_schedule_args(cfg))
+
+
+register_pricer(PricerSpec("binomial", "core.binomial_tree", "binomial_tree", _binomial_args,
+                           needs_paths=False, description="Binomial tree (single underlying)"))
+register_pricer(PricerSpec("lsm_poly", "core.lsm_traditional", "lsm_traditional", _lsm_poly_args,
+                           description="LSM with polynomial regression",
+                           batch_function="lsm_traditional_batch", batch_args=("K", "option_side")))
+register_pricer(PricerSpec("lsm_boundary", "core.exercise_boundary", "lsm_boundary", _lsm_boundary_args,
+                           description="Cached exercise boundary from polynomial LSM, priced by threshold comparison"))
+register_pricer(PricerSpec("lsm_poly_sharded", "core.lsm_sharded", "lsm_sharded", _lsm_poly_sharded_args,
+                           needs_paths=False,
+                           description="Polynomial LSM with paths sharded across num_workers processes"))
+register_pricer(PricerSpec("lsm_fnn", "core.lsm_fnn", "lsm_global_fnn", _lsm_fnn_args,
+                           description="LSM with a global feedforward neural network (imports torch)"))
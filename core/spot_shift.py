@@ -0,0 +1,97 @@
+import numpy as np
+from enums import OptionSide, OptionType, PayoffStyle
+from typing import Dict, Optional, Union
+
+from .lsm_traditional import lsm_traditional
+
+
+class SpotShiftRepricer:
+    """
+    Reprices an option for new spot prices without regenerating paths or refitting the continuation model
+
+    GBM paths scale linearly in S0, so paths are kept normalized to start at 1 and rescaled to a new
+    spot with one multiply. The continuation model is fit on moneyness S / K, so it stays valid when spot
+    moves and the strikes do not. A reprice is therefore one rescale plus one backward sweep
+
+    Build one with from_lsm_traditional (single asset) or from_lsm_global_fnn (one or many assets)
+    """
+
+    def __init__(self, S_paths: np.ndarray, K: Union[float, np.ndarray], r: float, dt: float,
+                 option_side: OptionSide, option_type: OptionType, exercise_points: Optional[np.ndarray],
+                 time_grid: Optional[np.ndarray] = None, payoff_style: Optional[PayoffStyle] = None,
+                 poly_degree: Optional[int] = None, coefficients: Optional[Dict[int, np.ndarray]] = None,
+                 model=None):
+        if (coefficients is None) == (model is None):
+            raise ValueError("SpotShiftRepricer needs exactly one of polynomial coefficients or an FNN model")
+
+        # Normalize every path (and asset) by its starting price
+        self.normalized_paths = S_paths / S_paths[:, :1]
+        self._buffer = np.empty_like(self.normalized_paths)
+
+        self.K = K
+        self.r = r
+        self.dt = dt
+        self.option_side = option_side
+        self.option_type = option_type
+        self.exercise_points = exercise_points
+        self.time_grid = time_grid
+        self.payoff_style = payoff_style
+        self.poly_degree = poly_degree
+        self.coefficients = coefficients
+        self.model = model
+
+
+    @classmethod
+    def from_lsm_traditional(cls, S_paths: np.ndarray, K: float, r: float, dt: float, poly_degree: int,
+                             option_side: OptionSide, option_type: OptionType,
+                             exercise_points: Optional[np.ndarray], time_grid: Optional[np.ndarray] = None):
+        """
+        Fits the polynomial LSM on moneyness once and keeps the paths and coefficients for repricing
+        """
+        _, coefficients = lsm_traditional(S_paths, K, r, dt, poly_degree, option_side, option_type,
+                                          exercise_points, time_grid, return_coefficients=True, moneyness=True)
+        return cls(S_paths, K, r, dt, option_side, option_type, exercise_points, time_grid,
+                   poly_degree=poly_degree, coefficients=coefficients)
+
+
+    @classmethod
+    def from_lsm_global_fnn(cls, S_paths: np.ndarray, K: Union[float, np.ndarray], r: float, dt: float,
+                            option_side: OptionSide, option_type: OptionType,
+                            exercise_points: Optional[np.ndarray], nn_layers: Optional[list], num_of_epochs: int,
+                            time_grid: Optional[np.ndarray] = None, payoff_style: Optional[PayoffStyle] = None,
+                            num_workers: int = 1):
+        """
+        Trains the global FNN on moneyness once and keeps the paths and model for repricing
+        """
+        from .lsm_fnn import fit_global_fnn # torch is only imported for FNN repricers
+        from .payoffs import compute_payoff
+
+        payoff = compute_payoff(S_paths, K, option_side, payoff_style)
+        model = fit_global_fnn(S_paths, payoff, r, dt, option_type, exercise_points, nn_layers, num_of_epochs,
+                               time_grid, num_workers, K)
+        return cls(S_paths, K, r, dt, option_side, option_type, exercise_points, time_grid,
+                   payoff_style=payoff_style, model=model)
+
+
+    def rescaled_paths(self, init_stock_prices: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Paths for the new spot price(s), written into a reused buffer (valid until the next call)
+        """
+        return np.multiply(self.normalized_paths, init_stock_prices, out=self._buffer)
+
+
+    def reprice(self, init_stock_prices: Union[float, np.ndarray]) -> float:
+        """
+        Prices the option for new initial stock prices, a float for one asset or shape (D,) for many
+        """
+        S_paths = self.rescaled_paths(init_stock_prices)
+
+        if self.coefficients is not None:
+            return lsm_traditional(S_paths, self.K, self.r, self.dt, self.poly_degree, self.option_side,
+                                   self.option_type, self.exercise_points, self.time_grid,
+                                   moneyness=True, coefficients=self.coefficients)
+
+        from .lsm_fnn import lsm_global_fnn
+        return lsm_global_fnn(S_paths, self.K, self.r, self.dt, self.option_side, self.option_type,
+                              self.exercise_points, None, 0, model=self.model, time_grid=self.time_grid,
+                              payoff_style=self.payoff_style, moneyness=True)
@@ -1 +1 @@
-from .option_types import OptionSide, OptionType, ExerciseFrequency, CorrelationType
\ No newline at end of file
+from .option_types import OptionSide, OptionType, ExerciseFrequency, CorrelationType, PayoffStyle
\ No newline at end of file
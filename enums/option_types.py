@@ -17,6 +17,12 @@ class OptionSide(Enum):
     CALL = 'call'
     PUT = 'put'
 
+# Only needed if there is more than one underlying
+class PayoffStyle(Enum):
+    BASKET = 'basket' # payoff on the equal weighted basket against the mean strike
+    MAX = 'max'       # best of the per-asset payoffs
+    MIN = 'min'       # worst of the per-asset payoffs
+
 class CorrelationType(Enum):
     UNIFORM = "uniform",
     IDENTITY = "identity",
@@ -0,0 +1,64 @@
+"""
+Scaling benchmark for data-parallel CPU training of the global FNN
+
+Builds the lsm_global_fnn training set from config.yaml, trains once on a single worker to set the
+target loss, then reports the time each worker count takes to reach that loss
+
+Run from the repo root:
+    PYTHONPATH=. python extra/bench_parallel_training.py --max-workers 8
+"""
+import argparse
+import os
+import time
+
+import torch
+
+from config import load_config_from_yaml
+from core import simulate_paths, compute_payoff, build_training_set, train_data_parallel
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="Target loss is the single worker's final loss times (1 + tolerance)")
+    args = parser.parse_args()
+
+    cfg = load_config_from_yaml(args.config)
+    S_paths = simulate_paths(cfg)
+
+    K = cfg.strike_prices[0] if cfg.dimensions == 1 else cfg.strike_prices
+    payoff = compute_payoff(S_paths, K, cfg.option_side, cfg.payoff_style)
+    exercise_points = cfg.exercise_points if cfg.time_grid is None else cfg.grid_exercise_points
+    X, Y = build_training_set(S_paths, payoff, cfg.risk_free_interest, cfg.time_step,
+                              cfg.option_type, exercise_points, cfg.time_grid)
+    X, Y = torch.from_numpy(X), torch.from_numpy(Y)
+    print(f"Training set: {X.shape[0]} rows, {X.shape[1]} features, {cfg.epochs} epochs")
+
+    # Reference run on one worker sets the target loss
+    torch.manual_seed(0)
+    _, history = train_data_parallel(X, Y, cfg.nn_layers, cfg.epochs, num_workers=1)
+    target_loss = history[-1, 0] * (1 + args.tolerance)
+    print(f"Target loss: {target_loss:.6f}")
+
+    print(f"{'workers':>8} {'epochs':>8} {'train (s)':>10} {'total (s)':>10} {'speedup':>8}")
+    baseline = None
+    for num_workers in range(1, args.max_workers + 1):
+        torch.manual_seed(0)
+        start = time.perf_counter()
+        _, history = train_data_parallel(X, Y, cfg.nn_layers, 3 * cfg.epochs, num_workers,
+                                         target_loss=target_loss)
+        total = time.perf_counter() - start
+
+        # Time inside the training loop, excludes process spawn and process group setup
+        train_time = history[-1, 1]
+        reached = history[-1, 0] <= target_loss
+        baseline = baseline or train_time
+
+        print(f"{num_workers:>8} {len(history):>8} {train_time:>10.3f} {total:>10.3f} "
+              f"{baseline / train_time:>7.2f}x{'' if reached else '  (target not reached)'}")
+
+
+if __name__ == "__main__":
+    main()
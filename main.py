@@ -1,55 +1,68 @@
 import time
-import torch
 
+# Measure startup cost before anything heavy is imported
+_start_time = time.perf_counter()
 
-import numpy as np
-from config import Config, load_config_from_yaml
-from enums import OptionType, ExerciseFrequency
-from core import binomial_tree 
-from core import generate_gbm_paths, generate_multidim_gbm_paths
-from core import lsm_traditional
-from core import lsm_global_fnn
+import argparse
+import sys
+
+from config import load_config_from_yaml
+from core import get_pricer, simulate_paths, PRICERS
+
+_import_time = time.perf_counter() - _start_time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Price an option with the pricers selected in the config")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--pricer", action="append", choices=sorted(PRICERS),
+                        help="Pricer to run, can be repeated. Overrides `pricers` in the config")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     # Load Config
-    cfg = load_config_from_yaml("config.yaml")
-    
+    start = time.perf_counter()
+    cfg = load_config_from_yaml(args.config)
+    if args.pricer:
+        cfg.pricers = args.pricer
+    config_time = time.perf_counter() - start
+
     print(cfg)
-    
-    S_paths = generate_multidim_gbm_paths(
-        S0=cfg.init_stock_prices,
-        ir=cfg.risk_free_interest,
-        sigma=cfg.volatilities,
-        corr_matrix=cfg.correlation_matrix,
-        T=cfg.time_to_exp,
-        N=cfg.num_of_steps,
-        M=cfg.num_of_paths
-    )
-
-    # binomial_price = binomial_tree(cfg.init_stock_price, cfg.strike_price, cfg.time_to_exp, cfg.risk_free_interest, cfg.volatility, cfg.num_of_steps, cfg.option_side, cfg.option_type, cfg.exercise_points)
-
-    # poly_price1 = lsm_traditional(S_paths, cfg.strike_price, cfg.risk_free_interest, 
-    #                               cfg.time_step, cfg.poly_degree, cfg.option_side, cfg.option_type, cfg.exercise_points)
-    
-    
-    # start_time = time.time()
-    # fnn_price = lsm_global_fnn(S_paths, cfg.strike_price, cfg.risk_free_interest, cfg.time_step, cfg.option_side, cfg.option_type, cfg.exercise_points, cfg.nn_layers, cfg.epochs)
-    # end_time = time.time()
-
-    # print(cfg.get_details())
-    # print(f"Binomial Tree Price: {binomial_price:.6f}")
-    # print(f"Poly LSM Price: {poly_price1:.6f}")
-    # print(f"Global FNN-Enhanced LSM Price: {fnn_price:6f}")
-    # print(f"Using {torch.cuda.get_device_name(0)}, took {end_time - start_time:.4f} seconds")
-    
-
-    # print(f"Binomial Tree took {end - start:.4f} seconds")
-    # print(f"Poly Price 3-degree: {poly_price3}")
-    # print(f"Poly Price 2-degree: {poly_price2}")
-    # print(f"Poly Price 1-degree: {poly_price1}")
-    # print(f"Global - FNN Price: {fnn_price}")
+
+    pricers = [get_pricer(name) for name in cfg.pricers]
+
+    S_paths = None
+    path_time = 0.0
+    if any(pricer.needs_paths for pricer in pricers):
+        start = time.perf_counter()
+        S_paths = simulate_paths(cfg)
+        path_time = time.perf_counter() - start
+
+    print(f"Startup: imports took {_import_time:.4f} seconds, config took {config_time:.4f} seconds")
+    print(f"Path generation took {path_time:.4f} seconds")
+
+    for pricer in pricers:
+        # Loading a pricer imports its backend (e.g. torch for lsm_fnn)
+        start = time.perf_counter()
+        modules_before = len(sys.modules)
+        pricer.load()
+        load_time = time.perf_counter() - start
+        new_modules = len(sys.modules) - modules_before
+
+        start = time.perf_counter()
+        try:
+            price = pricer.price(cfg, S_paths)
+        except ValueError as e:
+            print(f"{pricer.name}: skipped, {e}")
+            continue
+        price_time = time.perf_counter() - start
+
+        print(f"{pricer.name}: price {price:.6f}, took {price_time:.4f} seconds "
+              f"(backend import {load_time:.4f} seconds, {new_modules} new modules)")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1 @@
+from .daemon import PricingService, ServiceStats, serve_stdio, serve_socket
\ No newline at end of file
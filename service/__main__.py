@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+
+import yaml
+
+from service import PricingService, serve_stdio, serve_socket
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running pricing daemon (newline-delimited JSON requests)")
+    parser.add_argument("--config", default="config.yaml", help="Base config that requests are merged on top of")
+    parser.add_argument("--stdio", action="store_true", help="Serve requests over stdin/stdout")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Serve over a unix socket at this path instead of TCP")
+    parser.add_argument("--workers", type=int, default=1, help="Compute worker threads")
+    parser.add_argument("--batch-window", type=float, default=0.005, help="Seconds to wait for requests to coalesce")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        base_config = yaml.safe_load(f)
+
+    async def run():
+        service = PricingService(base_config, num_workers=args.workers, batch_window=args.batch_window)
+        await service.start()
+        try:
+            if args.stdio:
+                await serve_stdio(service)
+            else:
+                await serve_socket(service, host=args.host, port=args.port, unix_path=args.unix)
+        finally:
+            await service.stop()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
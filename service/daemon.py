@@ -0,0 +1,477 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config, load_config_from_dict
+from core import get_pricer, simulate_paths, compute_payoff, exercise_date_mask
+from enums import OptionType
+
+
+@dataclass
+class ServiceStats:
+    """
+    Latency and throughput counters exposed through the {"cmd": "stats"} request
+    """
+    started_at: float = field(default_factory=time.perf_counter)
+    requests_total: int = 0
+    requests_failed: int = 0
+    requests_batched: int = 0
+    batches_total: int = 0
+    path_cache_hits: int = 0
+    path_cache_misses: int = 0
+    model_cache_hits: int = 0
+    model_cache_misses: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    def record(self, latency: float, failed: bool):
+        self.requests_total += 1
+        self.requests_failed += int(failed)
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started_at
+        completed = max(self.requests_total, 1)
+        return {
+            "uptime_s": uptime,
+            "requests_total": self.requests_total,
+            "requests_failed": self.requests_failed,
+            "batches_total": self.batches_total,
+            "mean_batch_size": self.requests_batched / max(self.batches_total, 1),
+            "throughput_rps": self.requests_total / uptime if uptime > 0 else 0.0,
+            "latency_mean_ms": 1000 * self.latency_total / completed,
+            "latency_max_ms": 1000 * self.latency_max,
+            "path_cache_hits": self.path_cache_hits,
+            "path_cache_misses": self.path_cache_misses,
+            "model_cache_hits": self.model_cache_hits,
+            "model_cache_misses": self.model_cache_misses,
+        }
+
+
+@dataclass
+class _PendingRequest:
+    request_id: object
+    method: str
+    cfg: Config
+    key: Tuple
+    received_at: float
+    future: asyncio.Future
+
+
+def path_key(cfg: Config) -> Tuple:
+    """
+    Requests with the same key share underlyings and can be valued on one path set
+    """
+    corr = None if cfg.correlation_matrix is None else np.asarray(cfg.correlation_matrix, dtype=float).tobytes()
+    return (
+        cfg.dimensions,
+        tuple(np.asarray(cfg.init_stock_prices, dtype=float)),
+        tuple(np.asarray(cfg.volatilities, dtype=float)),
+        corr,
+        cfg.risk_free_interest,
+        cfg.time_to_exp,
+        cfg.num_of_steps,
+        cfg.num_of_paths,
+        None if cfg.time_grid is None else tuple(cfg.time_grid),
+    )
+
+
+def _freeze(value):
+    """
+    Hashable, full precision form of pricer arguments, used to find identical contracts
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((name, _freeze(v)) for name, v in value.items()))
+    if isinstance(value, np.ndarray):
+        return (value.shape, tuple(value.ravel().tolist()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class PricingService:
+    """
+    Long-running pricer that keeps paths and trained models warm between requests
+
+    Requests are JSON objects shaped like config.yaml (any missing key falls back to the base config),
+    plus an optional "id" and "method". Requests that arrive within `batch_window` seconds of each other
+    and share underlyings are coalesced into one batch on a single path set. Identical contracts are priced
+    once, and contracts of a pricer with a batch_function (e.g. lsm_poly) are valued together in one call
+    """
+
+    def __init__(self, base_config: Optional[dict] = None, num_workers: int = 1,
+                 batch_window: float = 0.005, max_cached_paths: int = 8, max_cached_models: int = 32):
+        self.base_config = dict(base_config or {})
+        self.batch_window = batch_window
+        self.max_cached_paths = max_cached_paths
+        self.max_cached_models = max_cached_models
+        self.stats = ServiceStats()
+
+        self._executor = ThreadPoolExecutor(max_workers=num_workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._batches = set()
+
+        # Warm state shared by the compute workers
+        self._paths: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._models: "OrderedDict[Tuple, object]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+
+    async def stop(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=True)
+
+
+    async def handle_line(self, line: str) -> dict:
+        """
+        Parses one JSON request line and returns the JSON-serializable response
+        """
+        received_at = time.perf_counter()
+
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            self.stats.record(time.perf_counter() - received_at, failed=True)
+            return {"error": f"Invalid JSON: {e}"}
+
+        if not isinstance(request, dict):
+            self.stats.record(time.perf_counter() - received_at, failed=True)
+            return {"error": "Invalid request: expected a JSON object"}
+
+        if request.get("cmd") == "stats":
+            return {"id": request.get("id"), "stats": self.stats.snapshot()}
+
+        request_id = request.pop("id", None)
+        method = request.pop("method", None)
+
+        try:
+            cfg = load_config_from_dict({**self.base_config, **request})
+            # Without an explicit method, the first configured pricer is used
+            method = method or cfg.pricers[0]
+            get_pricer(method)
+            key = path_key(cfg)
+        except (KeyError, TypeError, ValueError) as e:
+            self.stats.record(time.perf_counter() - received_at, failed=True)
+            return {"id": request_id, "error": f"Invalid request: {e}"}
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(request_id, method, cfg, key, received_at, future))
+
+        try:
+            price = await future
+        except Exception as e:
+            self.stats.record(time.perf_counter() - received_at, failed=True)
+            return {"id": request_id, "method": method, "error": str(e)}
+
+        latency = time.perf_counter() - received_at
+        self.stats.record(latency, failed=False)
+        return {"id": request_id, "method": method, "price": float(price), "latency_ms": 1000 * latency}
+
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            pending = [await self._queue.get()]
+
+            # Give concurrent requests a short window to join this batch
+            await asyncio.sleep(self.batch_window)
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            try:
+                groups: Dict[Tuple, List[_PendingRequest]] = {}
+                for req in pending:
+                    groups.setdefault(req.key, []).append(req)
+
+                for key, group in groups.items():
+                    self.stats.batches_total += 1
+                    self.stats.requests_batched += len(group)
+                    task = loop.create_task(self._run_batch(key, group))
+                    self._batches.add(task)
+                    task.add_done_callback(self._batches.discard)
+            except Exception as e:
+                # Fail these requests rather than the loop, later requests still need a batcher
+                self._fail(pending, e)
+
+
+    async def _run_batch(self, key: Tuple, group: List[_PendingRequest]):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, self._value_batch, key, group)
+        except Exception as e:
+            self._fail(group, e)
+            return
+
+        for req, (price, error) in zip(group, results):
+            if req.future.done():
+                continue
+            if error is not None:
+                req.future.set_exception(error)
+            else:
+                req.future.set_result(price)
+
+
+    @staticmethod
+    def _fail(requests: List[_PendingRequest], error: Exception):
+        for req in requests:
+            if not req.future.done():
+                req.future.set_exception(error)
+
+
+    def _value_batch(self, key: Tuple, group: List[_PendingRequest]) -> List[Tuple[Optional[float], Optional[Exception]]]:
+        """
+        Values every request in the group on one shared path set (runs on a worker thread)
+        """
+        needs_paths = any(get_pricer(req.method).needs_paths for req in group)
+
+        try:
+            S_paths = self._get_paths(key, group[0].cfg) if needs_paths else None
+        except Exception as e:
+            return [(None, e)] * len(group)
+
+        # Identical contracts (same method and pricer arguments) are only priced once
+        results: List[Tuple[Optional[float], Optional[Exception]]] = [(None, None)] * len(group)
+        contracts: Dict[Tuple, Tuple[_PendingRequest, dict]] = {}
+        members: Dict[Tuple, List[int]] = {}
+
+        for i, req in enumerate(group):
+            try:
+                args = get_pricer(req.method).build_args(req.cfg, S_paths)
+            except Exception as e:
+                results[i] = (None, e)
+                continue
+
+            contract = (req.method, _freeze({name: v for name, v in args.items() if name != "S_paths"}))
+            contracts.setdefault(contract, (req, args))
+            members.setdefault(contract, []).append(i)
+
+        priced = self._price_contracts(key, S_paths, contracts)
+        for contract, indices in members.items():
+            for i in indices:
+                results[i] = priced[contract]
+
+        return results
+
+
+    def _price_contracts(self, key: Tuple, S_paths: Optional[np.ndarray],
+                         contracts: Dict[Tuple, Tuple[_PendingRequest, dict]]) -> Dict[Tuple, Tuple[Optional[float], Optional[Exception]]]:
+        """
+        Prices distinct contracts, valuing those that share a batchable pricer and all other arguments in one call
+        """
+        priced: Dict[Tuple, Tuple[Optional[float], Optional[Exception]]] = {}
+        batches: Dict[Tuple, List[Tuple[Tuple, _PendingRequest, dict]]] = {}
+
+        for contract, (req, args) in contracts.items():
+            pricer = get_pricer(req.method)
+            if pricer.batch_function is None:
+                batch_key = contract
+            else:
+                batch_key = (req.method, _freeze({name: v for name, v in args.items()
+                                                  if name != "S_paths" and name not in pricer.batch_args}))
+            batches.setdefault(batch_key, []).append((contract, req, args))
+
+        for batch in batches.values():
+            if len(batch) == 1:
+                contract, req, _ = batch[0]
+                try:
+                    priced[contract] = (self._price(req.method, req.cfg, key, S_paths), None)
+                except Exception as e:
+                    priced[contract] = (None, e)
+                continue
+
+            pricer = get_pricer(batch[0][1].method)
+            shared = {name: v for name, v in batch[0][2].items() if name not in pricer.batch_args}
+            stacked = {name: [args[name] for _, _, args in batch] for name in pricer.batch_args}
+            try:
+                prices = pricer.load_batch()(**shared, **stacked)
+                for (contract, _, _), price in zip(batch, prices):
+                    priced[contract] = (price, None)
+            except Exception as e:
+                for contract, _, _ in batch:
+                    priced[contract] = (None, e)
+
+        return priced
+
+
+    def _price(self, method: str, cfg: Config, key: Tuple, S_paths: Optional[np.ndarray]) -> float:
+        pricer = get_pricer(method)
+
+        if method == "lsm_fnn" and self._has_early_exercise(cfg, S_paths):
+            return pricer.price(cfg, S_paths, model=self._get_model(key, cfg, S_paths))
+
+        return pricer.price(cfg, S_paths)
+
+
+    def _has_early_exercise(self, cfg: Config, S_paths: np.ndarray) -> bool:
+        # Without an itm path on an early exercise date lsm_fnn prices as a European and never needs a trained model
+        if cfg.option_type == OptionType.EUROPEAN:
+            return False
+        args = get_pricer("lsm_fnn").build_args(cfg, S_paths)
+        exercise_dates = np.flatnonzero(exercise_date_mask(S_paths.shape[1] - 1, cfg.option_type, args["exercise_points"]))
+        payoff = compute_payoff(S_paths[:, exercise_dates], args["K"], cfg.option_side, cfg.payoff_style)
+        return bool((payoff > 0).any())
+
+
+    def _key_lock(self, key: Tuple) -> threading.Lock:
+        # Locks live as long as their cache entry, they are dropped on eviction
+        with self._cache_lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+
+    def _get_paths(self, key: Tuple, cfg: Config) -> np.ndarray:
+        with self._key_lock(key):
+            with self._cache_lock:
+                if key in self._paths:
+                    self._paths.move_to_end(key)
+                    self.stats.path_cache_hits += 1
+                    return self._paths[key]
+
+            try:
+                S_paths = simulate_paths(cfg)
+            except Exception:
+                self._forget_key_lock(key)
+                raise
+
+            with self._cache_lock:
+                self.stats.path_cache_misses += 1
+                self._paths[key] = S_paths
+                while len(self._paths) > self.max_cached_paths:
+                    evicted, _ = self._paths.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                    self._drop_models(evicted)
+
+            return S_paths
+
+
+    def _get_model(self, key: Tuple, cfg: Config, S_paths: np.ndarray):
+        # Same arguments the lsm_fnn pricer will be called with, so the model matches the contract
+        args = get_pricer("lsm_fnn").build_args(cfg, S_paths)
+        exercise_points = args["exercise_points"]
+        model_key = (key, tuple(np.ravel(args["K"])), cfg.option_side, cfg.payoff_style, cfg.option_type,
+                     None if exercise_points is None else tuple(exercise_points), tuple(cfg.nn_layers), cfg.epochs)
+
+        with self._key_lock(model_key):
+            with self._cache_lock:
+                if model_key in self._models:
+                    self._models.move_to_end(model_key)
+                    self.stats.model_cache_hits += 1
+                    return self._models[model_key]
+
+            try:
+                payoff = compute_payoff(S_paths, args["K"], cfg.option_side, cfg.payoff_style)
+                from core import fit_global_fnn # torch is only imported once an FNN is requested
+                model = fit_global_fnn(S_paths, payoff, cfg.risk_free_interest, cfg.time_step, cfg.option_type,
+                                       exercise_points, cfg.nn_layers, cfg.epochs, args.get("time_grid"),
+                                       cfg.num_workers)
+            except Exception:
+                self._forget_key_lock(model_key)
+                raise
+
+            with self._cache_lock:
+                self.stats.model_cache_misses += 1
+                self._models[model_key] = model
+                while len(self._models) > self.max_cached_models:
+                    evicted, _ = self._models.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+
+            return model
+
+
+    def _forget_key_lock(self, key: Tuple):
+        # Nothing was cached under this key, so its lock would otherwise never be dropped
+        with self._cache_lock:
+            self._key_locks.pop(key, None)
+
+
+    def _drop_models(self, key: Tuple):
+        # Models are only valid for the paths they were trained on
+        for model_key in [k for k in self._models if k[0] == key]:
+            del self._models[model_key]
+            self._key_locks.pop(model_key, None)
+
+
+async def serve_stdio(service: PricingService):
+    """
+    Reads one JSON request per line from stdin and writes one JSON response per line to stdout
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    tasks = set()
+
+    async def respond(line: str):
+        response = await service.handle_line(line)
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        task = asyncio.create_task(respond(line.decode()))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def serve_socket(service: PricingService, host: str = "127.0.0.1", port: int = 8765,
+                       unix_path: Optional[str] = None):
+    """
+    Serves newline-delimited JSON requests over a local TCP or unix socket
+    """
+    async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line: str):
+            response = await service.handle_line(line)
+            async with write_lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.create_task(respond(line.decode()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        writer.close()
+
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(handle_client, path=unix_path)
+    else:
+        server = await asyncio.start_server(handle_client, host=host, port=port)
+
+    async with server:
+        await server.serve_forever()